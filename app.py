@@ -7,7 +7,6 @@ Author: AI Resume Analyzer Team
 """
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 from utils.text_extractor import extract_text_from_file
 from utils.nlp_processor import clean_text, extract_skills
@@ -16,20 +15,28 @@ from utils.skill_analyzer import analyze_skill_gaps
 from utils.improvement_suggester import generate_improvements
 import plotly.graph_objects as go
 import plotly.express as px
-from io import StringIO
+from io import StringIO, BytesIO
 import nltk
 import ssl
+import os
+import threading
+from datetime import datetime
 
 # Ensure NLTK data is available (for cloud deployments)
 def ensure_nltk_data():
     """Download NLTK data if not available"""
     try:
         # Set NLTK data path to ensure it's downloaded to the right location
-        import os
         nltk_data_dir = os.path.join(os.getcwd(), 'nltk_data')
         if not os.path.exists(nltk_data_dir):
             os.makedirs(nltk_data_dir)
-        nltk.data.path.insert(0, nltk_data_dir)
+        if nltk_data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, nltk_data_dir)
+
+        # Skip the lookups entirely if a previous run completed successfully
+        ready_file = os.path.join(nltk_data_dir, '.ready')
+        if os.path.exists(ready_file):
+            return True
 
         # Disable SSL verification for downloads (helps in some cloud environments)
         try:
@@ -47,6 +54,7 @@ def ensure_nltk_data():
             ('wordnet', 'corpora/wordnet')
         ]
 
+        all_available = True
         for package_name, data_path in packages_to_try:
             try:
                 nltk.data.find(data_path)
@@ -54,18 +62,29 @@ def ensure_nltk_data():
             except LookupError:
                 try:
                     print(f"Downloading NLTK {package_name}...")
-                    nltk.download(package_name, download_dir=nltk_data_dir, quiet=True)
+                    if not nltk.download(package_name, download_dir=nltk_data_dir, quiet=True):
+                        all_available = False
+                        continue
                     print(f"✓ NLTK {package_name} downloaded successfully")
                 except Exception as e:
                     print(f"⚠️ Failed to download NLTK {package_name}: {e}")
+                    all_available = False
                     continue
+
+        # Mark the data directory as ready so later processes skip the lookups
+        if all_available:
+            open(ready_file, 'w').close()
     except Exception as e:
         print(f"NLTK setup failed: {e}")
 
-# Initialize NLTK data on app startup
-print("Setting up NLTK data...")
-ensure_nltk_data()
-print("NLTK setup complete!")
+    return True
+
+@st.cache_resource(show_spinner=False)
+def _start_nltk_setup():
+    """Start NLTK data setup on a background thread (once per process)"""
+    thread = threading.Thread(target=ensure_nltk_data, daemon=True)
+    thread.start()
+    return thread
 
 # Configure page
 st.set_page_config(
@@ -111,6 +130,9 @@ st.markdown("""
 
 def main():
     """Main application function"""
+    # Initialize NLTK data in the background so the welcome screen isn't blocked
+    nltk_setup = _start_nltk_setup()
+
     st.markdown('<h1 class="main-header">🎯 Smart AI Resume Analyzer</h1>', unsafe_allow_html=True)
     st.markdown("---")
 
@@ -170,44 +192,99 @@ def main():
     else:
         # Perform analysis
         with st.spinner("Analyzing your resume... 🤖"):
+            # Analysis needs the NLTK data, so wait for the setup to finish
+            nltk_setup.join()
+
             try:
-                # Extract text from resume
-                resume_text = extract_text_from_file(uploaded_file)
+                # Reuse earlier results when the same file and job description are analyzed again
+                results = _analyze(uploaded_file.getvalue(), uploaded_file.name, job_description)
 
-                if not resume_text.strip():
+                if results is None:
                     st.error("❌ Could not extract text from the resume. Please check the file format.")
                     return
 
-                # Process texts
-                cleaned_resume = clean_text(resume_text)
-                cleaned_job = clean_text(job_description)
+                # Display results
+                display_results(*results)
 
-                # Calculate similarity score
-                similarity_score = calculate_similarity_score(cleaned_resume, cleaned_job)
+            except Exception as e:
+                st.error(f"❌ An error occurred during analysis: {str(e)}")
+                st.info("💡 Try uploading a different file or check if the job description is properly formatted.")
 
-                # Extract skills
-                resume_skills = extract_skills(cleaned_resume)
-                job_skills = extract_skills(cleaned_job)
+@st.cache_data(show_spinner=False, max_entries=32)
+def _analyze(file_bytes: bytes, filename: str, job_desc: str):
+    """
+    Run the full analysis pipeline for one resume and job description
 
-                # Analyze skill gaps
-                skill_gaps = analyze_skill_gaps(resume_skills, job_skills)
+    Returns:
+        tuple: (score, resume_skills, job_skills, gaps, improvements, resume_text),
+        or None if no text could be extracted from the resume
+    """
+    # Extract text from resume
+    upload = BytesIO(file_bytes)
+    upload.name = filename
+    resume_text = extract_text_from_file(upload)
 
-                # Generate improvements
-                improvements = generate_improvements(cleaned_resume, cleaned_job, skill_gaps)
+    if not resume_text.strip():
+        return None
 
-                # Display results
-                display_results(
-                    similarity_score,
-                    resume_skills,
-                    job_skills,
-                    skill_gaps,
-                    improvements,
-                    resume_text
-                )
+    # Process texts
+    cleaned_resume = clean_text(resume_text)
+    cleaned_job = clean_text(job_desc)
 
-            except Exception as e:
-                st.error(f"❌ An error occurred during analysis: {str(e)}")
-                st.info("💡 Try uploading a different file or check if the job description is properly formatted.")
+    # Calculate similarity score
+    similarity_score = calculate_similarity_score(cleaned_resume, cleaned_job)
+
+    # Extract skills
+    resume_skills = extract_skills(cleaned_resume)
+    job_skills = extract_skills(cleaned_job)
+
+    # Analyze skill gaps
+    try:
+        skill_gaps = analyze_skill_gaps(resume_skills, job_skills)
+    except Exception as e:
+        st.warning(f"Skill gap analysis failed: {str(e)}")
+        skill_gaps = []
+
+    # Generate improvements
+    improvements = generate_improvements(cleaned_resume, cleaned_job, skill_gaps)
+
+    return similarity_score, resume_skills, job_skills, skill_gaps, improvements, resume_text
+
+def _build_gauge(score: float):
+    """Build the match score gauge figure"""
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Match Score"},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "#1f77b4"},
+            'steps': [
+                {'range': [0, 40], 'color': "#ff6b6b"},
+                {'range': [40, 70], 'color': "#ffd93d"},
+                {'range': [70, 100], 'color': "#6bcf7f"}
+            ]
+        }
+    ))
+
+def _build_skills_bar(n_match: int, n_miss: int):
+    """Build the stacked matching/missing skills bar figure"""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Matching Skills',
+        x=['Skills'],
+        y=[n_match],
+        marker_color='#6bcf7f'
+    ))
+    fig.add_trace(go.Bar(
+        name='Missing Skills',
+        x=['Skills'],
+        y=[n_miss],
+        marker_color='#ff6b6b'
+    ))
+    fig.update_layout(barmode='stack', title="Skills Analysis")
+    return fig
 
 def display_results(score, resume_skills, job_skills, gaps, improvements, resume_text):
     """Display analysis results in organized sections"""
@@ -218,39 +295,22 @@ def display_results(score, resume_skills, job_skills, gaps, improvements, resume
 
     with col1:
         # Score gauge
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=score,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Match Score"},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': "#1f77b4"},
-                'steps': [
-                    {'range': [0, 40], 'color': "#ff6b6b"},
-                    {'range': [40, 70], 'color': "#ffd93d"},
-                    {'range': [70, 100], 'color': "#6bcf7f"}
-                ]
-            }
-        ))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_build_gauge(score), use_container_width=True)
 
     with col2:
-        st.markdown('<div class="score-card">', unsafe_allow_html=True)
-        st.markdown(f"**Score: {score:.1f}%**")
+        st.markdown(f'<div class="score-card"><strong>Score: {score:.1f}%</strong></div>',
+                   unsafe_allow_html=True)
         if score >= 80:
             st.success("🎉 Excellent match!")
         elif score >= 60:
             st.warning("👍 Good match")
         else:
             st.error("⚠️ Needs improvement")
-        st.markdown('</div>', unsafe_allow_html=True)
 
     with col3:
-        st.markdown('<div class="score-card">', unsafe_allow_html=True)
-        st.markdown("**Resume Length**")
-        st.markdown(f"{len(resume_text.split())} words")
-        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="score-card"><strong>Resume Length</strong><br>'
+                   f'{len(resume_text.split())} words</div>',
+                   unsafe_allow_html=True)
 
     st.markdown("---")
 
@@ -260,45 +320,30 @@ def display_results(score, resume_skills, job_skills, gaps, improvements, resume
     with col1:
         st.markdown("## 🎯 Your Skills")
         if resume_skills:
-            skills_df = pd.DataFrame({
-                'Skill': resume_skills[:10],  # Show top 10
-                'Source': ['Resume'] * len(resume_skills[:10])
-            })
-            st.dataframe(skills_df, use_container_width=True)
+            # Show top 10
+            st.dataframe([{'Skill': skill, 'Source': 'Resume'} for skill in resume_skills[:10]],
+                         use_container_width=True)
         else:
             st.info("No skills detected in resume")
 
     with col2:
         st.markdown("## 💼 Required Skills")
         if job_skills:
-            skills_df = pd.DataFrame({
-                'Skill': job_skills[:10],  # Show top 10
-                'Source': ['Job Description'] * len(job_skills[:10])
-            })
-            st.dataframe(skills_df, use_container_width=True)
+            # Show top 10
+            st.dataframe([{'Skill': skill, 'Source': 'Job Description'} for skill in job_skills[:10]],
+                         use_container_width=True)
         else:
             st.info("No skills detected in job description")
 
     # Skills comparison visualization
     if resume_skills and job_skills:
         st.markdown("### Skills Overlap Analysis")
-        common_skills = set(resume_skills) & set(job_skills)
-        missing_skills = set(job_skills) - set(resume_skills)
-
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            name='Matching Skills',
-            x=['Skills'],
-            y=[len(common_skills)],
-            marker_color='#6bcf7f'
-        ))
-        fig.add_trace(go.Bar(
-            name='Missing Skills',
-            x=['Skills'],
-            y=[len(missing_skills)],
-            marker_color='#ff6b6b'
-        ))
-        fig.update_layout(barmode='stack', title="Skills Analysis")
+        resume_set = set(resume_skills)
+        job_set = set(job_skills)
+        common_skills = resume_set & job_set
+        missing_skills = job_set - resume_set
+
+        fig = _build_skills_bar(len(common_skills), len(missing_skills))
         st.plotly_chart(fig, use_container_width=True)
 
     st.markdown("---")
@@ -306,9 +351,11 @@ def display_results(score, resume_skills, job_skills, gaps, improvements, resume
     # Skill Gaps Section
     st.markdown("## ⚠️ Skill Gaps")
     if gaps:
-        for gap in gaps[:5]:  # Show top 5 gaps
-            st.markdown(f'<div class="skill-gap">🔸 **{gap}** - Consider adding this to your resume</div>',
-                       unsafe_allow_html=True)
+        gaps_html = "".join(
+            f'<div class="skill-gap">🔸 <strong>{gap.title()}</strong> - Consider adding this to your resume</div>'
+            for gap in gaps[:5]  # Show top 5 gaps
+        )
+        st.markdown(gaps_html, unsafe_allow_html=True)
     else:
         st.success("🎉 No major skill gaps detected!")
 
@@ -317,9 +364,11 @@ def display_results(score, resume_skills, job_skills, gaps, improvements, resume
     # Improvement Suggestions
     st.markdown("## 💡 Improvement Suggestions")
     if improvements:
-        for i, improvement in enumerate(improvements[:5], 1):  # Show top 5
-            st.markdown(f'<div class="improvement">{i}. {improvement}</div>',
-                       unsafe_allow_html=True)
+        improvements_html = "".join(
+            f'<div class="improvement">{i}. {improvement}</div>'
+            for i, improvement in enumerate(improvements[:5], 1)  # Show top 5
+        )
+        st.markdown(improvements_html, unsafe_allow_html=True)
     else:
         st.info("No specific improvements suggested - your resume looks good!")
 
@@ -340,9 +389,9 @@ def display_results(score, resume_skills, job_skills, gaps, improvements, resume
     {', '.join(job_skills[:10])}
 
     Skill Gaps ({len(gaps)}):
-    {', '.join(gaps[:5])}
+    {', '.join(gap.title() for gap in gaps[:5])}
 
-    Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
+    Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     """
 
     st.download_button(
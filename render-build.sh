@@ -7,4 +7,7 @@ pip install -r requirements.txt
 echo "Downloading NLTK data..."
 python setup_nltk.py
 
+echo "Downloading spaCy model..."
+python -m spacy download en_core_web_sm
+
 echo "Build complete!"
@@ -5,13 +5,56 @@ Run with: python -m pytest tests/test_basic.py
 
 import sys
 import os
+import io
+import tempfile
+import zipfile
+from unittest import mock
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.nlp_processor import clean_text, extract_skills
-from utils.similarity_scorer import calculate_similarity_score
-from utils.skill_analyzer import analyze_skill_gaps
+from utils import nlp_processor
+from utils.nlp_processor import (clean_text, extract_skills, lemmatize_texts, lemmatize_tokens, remove_stopwords,
+                                 _CLEAN_RE, _CLEAN_RE_ASCII)
+from utils import similarity_scorer
+from utils.similarity_scorer import (calculate_similarity_score, calculate_skill_similarity, score_batch,
+                                     skill_score_batch, score_resumes, count_syllables, count_text_syllables)
+from utils.skill_analyzer import analyze_skill_gaps, prioritize_missing_skills
+from utils.text_extractor import extract_text_from_file, extract_text_from_pdf, extract_text_from_docx
 import pytest
 
+def _make_pdf(pages: list) -> bytes:
+    """Build a minimal PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+                       "/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+def _make_docx(body_xml: str, prolog: str = "") -> bytes:
+    """Build a minimal DOCX (a zip holding only word/document.xml) around body XML"""
+    document = (f'<?xml version="1.0" encoding="UTF-8"?>{prolog}'
+                f'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body_xml}</w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
 def test_text_cleaning():
     """Test text cleaning functionality"""
     dirty_text = "Hello!!! This is a TEST text with URLs: https://example.com and emails: test@email.com"
@@ -23,6 +66,56 @@ def test_text_cleaning():
     assert cleaned == cleaned.lower()  # Should be lowercase
     print("✓ Text cleaning test passed")
 
+def test_clean_text_unicode_whitespace():
+    """Test that both cleaning patterns agree on text with Unicode whitespace"""
+    samples = [
+        "see https://x.com\xa0Python and SQL",
+        "a\vb@c.com d",
+        "call 555-123-4567\u2003now\x1cplease",
+        "call １２３-４５６-７８９０ now",
+        "Résumé:\u00a0mail me@x.io\u2028or www.site.org"
+    ]
+    for text in samples:
+        collapsed = " ".join(text.lower().split())
+        expected = " ".join(_CLEAN_RE.sub(" ", collapsed).split())
+        if collapsed.isascii():
+            assert " ".join(_CLEAN_RE_ASCII.sub(" ", collapsed).split()) == expected
+        assert clean_text(text) == expected
+
+    assert clean_text("see https://x.com\xa0Python and SQL") == "see python and sql"
+    print("✓ Unicode whitespace cleaning test passed")
+
+def test_stopwords_retry():
+    """Test that stopwords missing at import are picked up once available"""
+    fake_corpus = mock.Mock()
+    fake_corpus.words.side_effect = [LookupError("stopwords"), ["the", "and"]]
+    with mock.patch.object(nlp_processor, "stopwords", fake_corpus), \
+            mock.patch.object(nlp_processor, "_stopwords", frozenset()), \
+            mock.patch.object(nlp_processor, "_stopwords_next_try", 0.0), \
+            mock.patch.object(nlp_processor, "_STOPWORDS_RETRY_SECONDS", 0.0):
+        assert remove_stopwords(["the", "python"]) == ["the", "python"]
+        assert remove_stopwords(["the", "python", "also"]) == ["python"]
+        assert remove_stopwords(["and"]) == []
+    assert fake_corpus.words.call_count == 2
+    print("✓ Stopword retry test passed")
+
+def test_clean_text_failure_not_cached():
+    """Test that a cleaning failure warns on every call and is not cached"""
+    class FailingPattern:
+        def sub(self, repl, text):
+            raise RuntimeError("regex failure")
+
+    text = "Failing input for the cleaning cache test"
+    with mock.patch.object(nlp_processor, "_CLEAN_RE_ASCII", FailingPattern()), \
+            mock.patch.object(nlp_processor, "st") as fake_st:
+        assert clean_text(text) == text
+        assert clean_text(text) == text
+    assert fake_st.warning.call_count == 2
+
+    # Once the failure is gone the text is cleaned normally
+    assert clean_text(text) == "failing input for the cleaning cache test"
+    print("✓ Cleaning failure test passed")
+
 def test_skill_extraction():
     """Test skill extraction from text"""
     text = "I am proficient in Python, JavaScript, and machine learning using TensorFlow."
@@ -46,6 +139,110 @@ def test_similarity_scoring():
     assert 0 <= score2 <= 100
     print("✓ Similarity scoring test passed")
 
+def test_batch_scoring():
+    """Test batch TF-IDF scoring of several resumes against one job"""
+    job = "python developer with django and flask experience"
+    resumes = ["python developer with django experience", "java developer with spring experience"]
+
+    scores = score_batch(job, resumes)
+
+    assert len(scores) == 2
+    assert scores[0] > scores[1]
+    assert all(0 <= s <= 100 for s in scores)
+
+    skill_scores = skill_score_batch(job, resumes)
+    assert list(skill_scores) == pytest.approx([calculate_skill_similarity(r, job) for r in resumes])
+
+    assert score_resumes(job, resumes) == [calculate_similarity_score(r, job) for r in resumes]
+    print("✓ Batch scoring test passed")
+
+def test_similarity_details_failure_not_cached():
+    """Test that a failed similarity analysis is reported on every call, not cached"""
+    # Only stopwords: the TF-IDF vocabulary is empty and fitting raises
+    with mock.patch.object(similarity_scorer, "st") as fake_st:
+        first = similarity_scorer.get_similarity_details("the and of", "is was the")
+        second = similarity_scorer.get_similarity_details("the and of", "is was the")
+    assert first == second and first["common_terms"] == []
+    assert first is not second
+    assert fake_st.error.call_count == 2
+    print("✓ Similarity details failure test passed")
+
+def test_syllable_counting():
+    """Test whole-text syllable counting against per-word counting"""
+    assert count_syllables("the") == 1
+    assert count_syllables("rhythm") == 1
+    assert count_syllables("developer") == 4
+
+    text = "The free team led 3 rhythm-based\nprojects; we made code faster. Bye"
+    assert count_text_syllables(text) == sum(count_syllables(w) for w in text.split())
+    print("✓ Syllable counting test passed")
+
+def test_lemmatization():
+    """Test batched and token-level lemmatization keep one result per input"""
+    lemmas = lemmatize_texts(["Managed several projects", "", "Led teams"])
+    assert len(lemmas) == 3
+    assert lemmas[1] == []
+    assert all(isinstance(lemma, str) for doc in lemmas for lemma in doc)
+
+    assert len(lemmatize_tokens(["managed", "projects"])) == 2
+    assert lemmatize_tokens([]) == []
+    print("✓ Lemmatization test passed")
+
+def test_spacy_lemmas():
+    """Test real lemmas from the spaCy pipeline when its model is installed"""
+    pytest.importorskip("spacy")
+    if nlp_processor._load_spacy() is None:
+        pytest.skip("spaCy model en_core_web_sm is not installed")
+
+    [lemmas] = lemmatize_texts(["She managed several projects"])
+    assert len(lemmas) == 4
+    assert lemmas[1] == "manage" and lemmas[3] == "project"
+
+    # Pre-split tokens keep the caller's tokenization
+    assert lemmatize_tokens(["She", "managed", "projects"])[1:] == ["manage", "project"]
+    print("✓ spaCy lemmatization test passed")
+
+def test_pdf_extraction():
+    """Test PDF extraction from in-memory and real file objects"""
+    pages = [f"Page {i} Python developer" for i in range(6)]
+    pdf_bytes = _make_pdf(pages)
+
+    assert extract_text_from_pdf(io.BytesIO(pdf_bytes)) == "\n".join(pages)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf_bytes)
+        with open(path, "rb") as f:
+            assert extract_text_from_pdf(f) == "\n".join(pages)
+            assert extract_text_from_file(f) == "\n".join(pages)
+    print("✓ PDF extraction test passed")
+
+def test_docx_extraction():
+    """Test DOCX extraction of paragraphs, runs, breaks and table cells"""
+    body = (
+        '<w:p><w:r><w:t>Senior </w:t></w:r><w:r><w:t>Python developer</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>SQL</w:t></w:r>'
+        '<w:hyperlink><w:r><w:t> and Docker</w:t></w:r></w:hyperlink></w:p>'
+        '<w:p><w:r><w:t>Before page</w:t><w:br w:type="page"/><w:t>after page</w:t></w:r></w:p>'
+        '<w:tbl><w:tr>'
+        '<w:tc><w:p><w:r><w:t>AWS</w:t></w:r></w:p><w:p><w:r><w:t>Azure</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:tcPr><w:gridSpan w:val="2"/></w:tcPr><w:p><w:r><w:t>merged</w:t></w:r></w:p></w:tc>'
+        '</w:tr></w:tbl>'
+    )
+    text = extract_text_from_docx(io.BytesIO(_make_docx(body)))
+    assert text == ("Senior Python developer\nSkills:\tSQL and Docker\nBefore page\nafter page\n"
+                    "AWS\nAzure\nmerged")
+
+    # Entities in untrusted uploads are never resolved
+    prolog = '<!DOCTYPE w:document [<!ENTITY secret SYSTEM "file:///etc/hostname">]>'
+    body = '<w:p><w:r><w:t>Name &secret;</w:t></w:r></w:p>'
+    assert extract_text_from_docx(io.BytesIO(_make_docx(body, prolog))) == "Name"
+
+    with pytest.raises(Exception, match="DOCX extraction failed"):
+        extract_text_from_docx(io.BytesIO(b"not a zip"))
+    print("✓ DOCX extraction test passed")
+
 def test_skill_gap_analysis():
     """Test skill gap analysis"""
     resume_skills = ["Python", "Django", "SQL"]
@@ -56,6 +253,12 @@ def test_skill_gap_analysis():
     assert "AWS" in gaps or "aws" in [g.lower() for g in gaps]
     assert "Docker" in gaps or "docker" in [g.lower() for g in gaps]
     assert "Python" not in gaps
+    assert gaps == ["aws", "docker"]  # Canonical lowercase, sorted
+    assert analyze_skill_gaps(job_skills + ["Git"], ["python", "aws"]) == []
+
+    job = "JavaScript and Java. Strong JavaScript, C++ and machine\nlearning; more JavaScript, machine learning"
+    prioritized = prioritize_missing_skills(["java", "c++", "machine learning", "javascript", "go"], job)
+    assert prioritized == ["javascript", "machine learning", "java", "c++", "go"]
     print("✓ Skill gap analysis test passed")
 
 def test_empty_inputs():
@@ -80,8 +283,21 @@ if __name__ == "__main__":
 
     try:
         test_text_cleaning()
+        test_clean_text_unicode_whitespace()
+        test_stopwords_retry()
+        test_clean_text_failure_not_cached()
         test_skill_extraction()
         test_similarity_scoring()
+        test_batch_scoring()
+        test_similarity_details_failure_not_cached()
+        test_syllable_counting()
+        test_lemmatization()
+        try:
+            test_spacy_lemmas()
+        except pytest.skip.Exception as e:
+            print(f"- spaCy lemmatization test skipped: {e}")
+        test_pdf_extraction()
+        test_docx_extraction()
         test_skill_gap_analysis()
         test_empty_inputs()
 
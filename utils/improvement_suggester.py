@@ -5,9 +5,26 @@ Generates actionable improvement suggestions based on resume analysis
 
 from utils.nlp_processor import get_text_statistics, clean_text
 from utils.similarity_scorer import get_similarity_details, get_readability_score
-import streamlit as st
+import logging
 import re
 
+log = logging.getLogger(__name__)
+
+# Indicators of quantified achievements and strong action verbs in a resume
+_ACHIEVEMENT_RE = re.compile(r'\b(?:increased|improved|reduced|achieved|delivered|managed|led)\b', re.I)
+_ACTION_RE = re.compile(r'\b(?:developed|created|implemented|designed|managed|led|optimized)\b', re.I)
+
+# Certifications to suggest for common skill gaps
+_CERT_MAP = {
+    'python': ('Python Institute PCAP', 'Google IT Automation with Python'),
+    'aws': ('AWS Certified Solutions Architect', 'AWS Certified Developer'),
+    'azure': ('Microsoft Azure Fundamentals', 'Microsoft Azure Administrator'),
+    'machine learning': ('Google Machine Learning Crash Course', 'Coursera ML Specialization'),
+    'docker': ('Docker Certified Associate', 'Kubernetes Certification'),
+    'sql': ('Oracle SQL Certification', 'Microsoft SQL Server Certification')
+}
+_CERT_KEYS = frozenset(_CERT_MAP)
+
 def generate_improvements(resume_text: str, job_text: str, skill_gaps: list) -> list:
     """
     Generate comprehensive improvement suggestions
@@ -15,7 +32,7 @@ def generate_improvements(resume_text: str, job_text: str, skill_gaps: list) ->
     Args:
         resume_text (str): Original resume text
         job_text (str): Job description text
-        skill_gaps (list): List of missing skills
+        skill_gaps (list): List of missing skills in canonical lowercase form
 
     Returns:
         list: List of improvement suggestions
@@ -23,6 +40,13 @@ def generate_improvements(resume_text: str, job_text: str, skill_gaps: list) ->
     suggestions = []
 
     try:
+        # Scan the resume once; the generators below read these features
+        features = extract_resume_features(resume_text, job_text)
+
+        # Too little text for the NLP passes below to say anything useful
+        if features['word_count'] < 20:
+            return ["Resume text is too short to analyze meaningfully; please upload a more complete resume."]
+
         # Get similarity details
         similarity_details = get_similarity_details(resume_text, job_text)
 
@@ -31,13 +55,11 @@ def generate_improvements(resume_text: str, job_text: str, skill_gaps: list) ->
         readability = get_readability_score(resume_text)
 
         # 1. Skill-based suggestions
-        skill_suggestions = generate_skill_suggestions(skill_gaps, job_text)
+        skill_suggestions = generate_skill_suggestions(skill_gaps, features)
         suggestions.extend(skill_suggestions)
 
         # 2. Content-based suggestions
-        content_suggestions = generate_content_suggestions(
-            resume_text, job_text, similarity_details
-        )
+        content_suggestions = generate_content_suggestions(features, similarity_details)
         suggestions.extend(content_suggestions)
 
         # 3. Structure-based suggestions
@@ -49,33 +71,52 @@ def generate_improvements(resume_text: str, job_text: str, skill_gaps: list) ->
         suggestions.extend(keyword_suggestions)
 
         # Remove duplicates and limit to top suggestions
-        suggestions = list(set(suggestions))[:10]
+        suggestions = list(dict.fromkeys(suggestions))[:10]
 
         return suggestions
 
     except Exception as e:
-        st.warning(f"Improvement generation failed: {str(e)}")
+        log.warning("Improvement generation failed: %s", e)
         return ["Review and update your resume with job-specific keywords and skills"]
 
-def generate_skill_suggestions(skill_gaps: list, job_text: str) -> list:
+def extract_resume_features(resume_text: str, job_text: str) -> dict:
+    """
+    Compute the text features shared by the suggestion generators in one pass
+
+    Args:
+        resume_text (str): Resume text
+        job_text (str): Job description text
+
+    Returns:
+        dict: Word count, keyword indicator hits and lowercased job text
+    """
+    return {
+        'word_count': len(resume_text.split()),
+        'achievement_hit': bool(_ACHIEVEMENT_RE.search(resume_text)),
+        'action_hit': bool(_ACTION_RE.search(resume_text)),
+        'job_lower': job_text.lower()
+    }
+
+def generate_skill_suggestions(skill_gaps: list, features: dict) -> list:
     """Generate skill-related improvement suggestions"""
     suggestions = []
 
     if skill_gaps:
-        suggestions.append(f"Add these missing skills to your resume: {', '.join(skill_gaps[:3])}")
+        top3 = skill_gaps[:3]
+        suggestions.append(f"Add these missing skills to your resume: {', '.join(skill.title() for skill in top3)}")
 
         # Check if skills are mentioned in job description
-        for skill in skill_gaps[:2]:
-            skill_lower = skill.lower()
-            if skill_lower in job_text.lower():
-                suggestions.append(f"Highlight your experience with {skill} more prominently")
+        job_text_lower = features['job_lower']
+        for skill in top3[:2]:
+            if skill in job_text_lower:
+                suggestions.append(f"Highlight your experience with {skill.title()} more prominently")
 
     if len(skill_gaps) > 5:
         suggestions.append("Consider gaining proficiency in some of the missing skills through online courses")
 
     return suggestions
 
-def generate_content_suggestions(resume_text: str, job_text: str, similarity_details: dict) -> list:
+def generate_content_suggestions(features: dict, similarity_details: dict) -> list:
     """Generate content-related improvement suggestions"""
     suggestions = []
 
@@ -86,22 +127,18 @@ def generate_content_suggestions(resume_text: str, job_text: str, similarity_det
         suggestions.append(f"Incorporate these job-specific keywords: {', '.join(top_keywords)}")
 
     # Check resume length
-    word_count = len(resume_text.split())
+    word_count = features['word_count']
     if word_count < 200:
         suggestions.append("Your resume seems short. Consider adding more relevant experience and achievements")
     elif word_count > 800:
         suggestions.append("Your resume is quite long. Consider condensing it to focus on the most relevant information")
 
     # Check for quantifiable achievements
-    achievement_indicators = ['increased', 'improved', 'reduced', 'achieved', 'delivered', 'managed', 'led']
-    has_achievements = any(indicator in resume_text.lower() for indicator in achievement_indicators)
-    if not has_achievements:
+    if not features['achievement_hit']:
         suggestions.append("Add quantifiable achievements and metrics to demonstrate your impact")
 
     # Check for action verbs
-    action_verbs = ['developed', 'created', 'implemented', 'designed', 'managed', 'led', 'optimized']
-    has_action_verbs = any(verb in resume_text.lower() for verb in action_verbs)
-    if not has_action_verbs:
+    if not features['action_hit']:
         suggestions.append("Use strong action verbs to describe your accomplishments")
 
     return suggestions
@@ -120,9 +157,9 @@ def generate_structure_suggestions(stats: dict, readability: dict) -> list:
     if flesch_score < 40:
         suggestions.append("Simplify language and technical jargon for better readability")
 
-    # Check word variety
-    total_words = stats.get('total_words', 1)
-    if total_words > 0:
+    # Check word variety (the ratio is too noisy to act on for short texts)
+    total_words = stats.get('total_words', 0)
+    if total_words >= 50:
         unique_words_ratio = stats.get('unique_words', 0) / total_words
         if unique_words_ratio < 0.3:
             suggestions.append("Use more varied vocabulary to make your resume more engaging")
@@ -175,7 +212,7 @@ def generate_actionable_tips(score: float, skill_gaps: list) -> list:
 
     Args:
         score (float): Match score
-        skill_gaps (list): List of missing skills
+        skill_gaps (list): List of missing skills in canonical lowercase form
 
     Returns:
         list: Actionable tips
@@ -190,7 +227,7 @@ def generate_actionable_tips(score: float, skill_gaps: list) -> list:
         ])
 
     if skill_gaps:
-        tips.append(f"Focus on gaining experience in: {', '.join(skill_gaps[:3])}")
+        tips.append(f"Focus on gaining experience in: {', '.join(skill.title() for skill in skill_gaps[:3])}")
 
     if score >= 60:
         tips.extend([
@@ -206,25 +243,15 @@ def suggest_certifications(skill_gaps: list) -> list:
     Suggest relevant certifications based on skill gaps
 
     Args:
-        skill_gaps (list): List of missing skills
+        skill_gaps (list): List of missing skills in canonical lowercase form
 
     Returns:
         list: Suggested certifications
     """
-    certification_map = {
-        'python': ['Python Institute PCAP', 'Google IT Automation with Python'],
-        'aws': ['AWS Certified Solutions Architect', 'AWS Certified Developer'],
-        'azure': ['Microsoft Azure Fundamentals', 'Microsoft Azure Administrator'],
-        'machine learning': ['Google Machine Learning Crash Course', 'Coursera ML Specialization'],
-        'docker': ['Docker Certified Associate', 'Kubernetes Certification'],
-        'sql': ['Oracle SQL Certification', 'Microsoft SQL Server Certification']
-    }
-
     suggestions = []
     for skill in skill_gaps[:3]:  # Top 3 gaps
-        skill_lower = skill.lower()
-        if skill_lower in certification_map:
-            certs = certification_map[skill_lower][:2]  # Max 2 per skill
+        if skill in _CERT_KEYS:
+            certs = _CERT_MAP[skill][:2]  # Max 2 per skill
             suggestions.extend([f"Consider {cert} certification" for cert in certs])
 
     return suggestions[:4]  # Max 4 certification suggestions
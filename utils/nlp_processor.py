@@ -3,32 +3,62 @@ NLP Processing Module
 Handles text cleaning, preprocessing, and skill extraction using NLTK and spaCy
 """
 
+import os
 import re
+import sys
+import time
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import WordNetLemmatizer
 import string
+from functools import lru_cache
 import streamlit as st
 
-# Download required NLTK data with better error handling
-nltk_packages = [
-    ('tokenizers/punkt', 'punkt'),
-    ('tokenizers/punkt_tab', 'punkt_tab'),
-    ('corpora/stopwords', 'stopwords'),
-    ('corpora/wordnet', 'wordnet')
-]
+try:
+    import re2
+except ImportError:  # Fall back to the stdlib regex engine
+    re2 = None
+
+# Also look in the project-local data directory used by the app's NLTK setup.
+# Missing data is downloaded there by the app's background setup thread
+# (app.ensure_nltk_data) or by setup_nltk.py at build time, never at import,
+# so importing this module doesn't block the first render
+_PROJECT_NLTK_DATA = os.path.join(os.getcwd(), 'nltk_data')
+if _PROJECT_NLTK_DATA not in nltk.data.path:
+    nltk.data.path.insert(0, _PROJECT_NLTK_DATA)
+
+# Stopwords, loaded once they are available; see _get_stopwords
+_CUSTOM_STOPWORDS = {'also', 'would', 'could', 'should', 'may', 'might', 'must'}
+_STOPWORDS_RETRY_SECONDS = 5.0
+_stopwords = frozenset()
+_stopwords_next_try = 0.0
+
+def _get_stopwords() -> frozenset:
+    """
+    English plus custom stopwords, cached after the first successful load
 
-for data_path, package_name in nltk_packages:
+    While the NLTK corpus is missing this returns an empty set (nothing is
+    filtered) and retries the load at most every few seconds, so data
+    downloaded later, e.g. by the app's background NLTK setup, is picked up
+    without a restart.
+    """
+    global _stopwords, _stopwords_next_try
+    if _stopwords or time.monotonic() < _stopwords_next_try:
+        return _stopwords
     try:
-        nltk.data.find(data_path)
-    except LookupError:
-        try:
-            print(f"Downloading NLTK package: {package_name}")
-            nltk.download(package_name, quiet=True)
-        except Exception as e:
-            print(f"Warning: Could not download {package_name}: {e}")
-            # Continue without failing - fallback tokenization will work
+        _stopwords = frozenset(stopwords.words('english')) | _CUSTOM_STOPWORDS
+    except Exception as e:
+        if not _stopwords_next_try:
+            print(f"Warning: Could not load NLTK stopwords: {e}")
+        _stopwords_next_try = time.monotonic() + _STOPWORDS_RETRY_SECONDS
+    return _stopwords
+
+# Load the stopwords now if they are already available
+_get_stopwords()
+
+# Lemmatizer, created once for the whole process
+_LEMMATIZER = WordNetLemmatizer()
 
 # Predefined skill keywords (can be expanded)
 TECHNICAL_SKILLS = {
@@ -47,6 +77,41 @@ SOFT_SKILLS = {
     'critical thinking', 'collaboration', 'mentoring', 'presentation'
 }
 
+_ALL_SKILLS = frozenset(TECHNICAL_SKILLS | SOFT_SKILLS)
+
+# Display form of every skill, built and interned once so extracted skills
+# share string objects and set operations on them compare by pointer
+_SKILL_TITLES = {skill: sys.intern(skill.title()) for skill in _ALL_SKILLS}
+
+# Every known skill as a whole word or phrase; longest alternatives first so
+# multi-word skills win over any skill they contain
+_SKILL_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(skill) for skill in sorted(_ALL_SKILLS, key=len, reverse=True)) + r')\b'
+)
+
+# URLs, email addresses, phone numbers and runs of special characters, removed by clean_text.
+# The stdlib pattern anchors the email branch at token starts so long tokens
+# without '@' are not rescanned from every offset.
+_CLEAN_RE = re.compile(
+    r'https?://\S+|www\.\S+'              # URLs
+    r'|(?<!\S)\S+@\S+'                    # Email addresses
+    r'|\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'     # Phone numbers
+    r'|[^\w\s]+'                          # Special characters
+)
+
+# RE2 matches in linear time, but its \s, \d and \b are ASCII-only. clean_text
+# only uses it on ASCII text with whitespace already collapsed to single
+# spaces, where both engines give the same result.
+if re2 is not None:
+    _CLEAN_RE_ASCII = re2.compile(
+        r'https?://\S+|www\.\S+'              # URLs
+        r'|\S+@\S+'                           # Email addresses
+        r'|\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'     # Phone numbers
+        r'|[^\w\s]+'                          # Special characters
+    )
+else:
+    _CLEAN_RE_ASCII = _CLEAN_RE
+
 def clean_text(text: str) -> str:
     """
     Clean and preprocess text for analysis
@@ -61,30 +126,25 @@ def clean_text(text: str) -> str:
         return ""
 
     try:
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-
-        # Remove phone numbers
-        text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '', text)
-
-        # Remove special characters but keep spaces and alphanumeric
-        text = re.sub(r'[^\w\s]', ' ', text)
-
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-
-        return text.strip()
-
+        return _clean_text_cached(text)
     except Exception as e:
+        # Failures are not cached, so the warning is shown on every call
         st.warning(f"Text cleaning failed: {str(e)}")
         return text
 
+@lru_cache(maxsize=1024)
+def _clean_text_cached(text: str) -> str:
+    """Clean text, cached per input; raises on failure"""
+    # Lowercase and collapse every kind of Unicode whitespace (NBSP, \v, ...)
+    # to single spaces, then strip URLs, emails, phone numbers and special
+    # characters in one pass
+    text = ' '.join(text.lower().split())
+    clean_re = _CLEAN_RE_ASCII if text.isascii() else _CLEAN_RE
+    text = clean_re.sub(' ', text)
+
+    # Remove extra whitespace
+    return ' '.join(text.split())
+
 def tokenize_text(text: str) -> list:
     """
     Tokenize text into words with robust fallback
@@ -95,21 +155,24 @@ def tokenize_text(text: str) -> list:
     Returns:
         list: List of tokens
     """
+    return list(_tokenize_cached(text))
+
+@lru_cache(maxsize=1024)
+def _tokenize_cached(text: str) -> tuple:
+    """Tokenize text, cached per input; returns an immutable tuple"""
     if not text or not text.strip():
-        return []
+        return ()
 
     # Method 1: Try NLTK punkt_tab (newer versions)
     try:
-        tokens = word_tokenize(text)
-        return tokens
+        return tuple(word_tokenize(text))
     except (LookupError, ImportError):
         pass
 
     # Method 2: Try NLTK punkt (older versions)
     try:
         import nltk.tokenize.punkt as punkt
-        tokens = word_tokenize(text)
-        return tokens
+        return tuple(word_tokenize(text))
     except (LookupError, ImportError):
         pass
 
@@ -119,38 +182,68 @@ def tokenize_text(text: str) -> list:
         # Split on whitespace and punctuation, keep only word characters
         tokens = re.findall(r'\b\w+\b', text.lower())
         # Filter out very short tokens and numbers only
-        tokens = [token for token in tokens if len(token) > 1 and not token.isdigit()]
-        return tokens
+        return tuple(token for token in tokens if len(token) > 1 and not token.isdigit())
     except Exception:
         pass
 
     # Method 4: Ultimate fallback - simple split
     tokens = text.lower().split()
-    tokens = [token.strip('.,!?;:()[]{}') for token in tokens if token.strip('.,!?;:()[]{}')]
-    return tokens
+    return tuple(token.strip('.,!?;:()[]{}') for token in tokens if token.strip('.,!?;:()[]{}'))
 
 def remove_stopwords(tokens: list) -> list:
     """
     Remove stopwords from token list
 
     Args:
-        tokens (list): List of tokens
+        tokens (list): List of lowercase tokens, e.g. from tokenize_text(clean_text(...))
 
     Returns:
         list: Filtered tokens without stopwords
     """
     try:
-        stop_words = set(stopwords.words('english'))
-        # Add custom stopwords
-        custom_stopwords = {'also', 'would', 'could', 'should', 'may', 'might', 'must'}
-        stop_words.update(custom_stopwords)
-
-        filtered_tokens = [word for word in tokens if word.lower() not in stop_words]
-        return filtered_tokens
+        stop_words = _get_stopwords()
+        return [word for word in tokens if word not in stop_words]
     except Exception as e:
         st.warning(f"Stopword removal failed: {str(e)}")
         return tokens
 
+@lru_cache(maxsize=1)
+def _load_spacy():
+    """Load the spaCy pipeline once, keeping only what lemmatization needs; None if unavailable"""
+    # Imported here rather than at module level: spaCy adds ~0.6s to a cold
+    # import and the app itself never lemmatizes
+    try:
+        import spacy
+    except ImportError:  # Fall back to NLTK's WordNet lemmatizer
+        return None
+    try:
+        # The rule-based lemmatizer relies on the tagger and attribute ruler for POS tags
+        nlp = spacy.load('en_core_web_sm', disable=['parser', 'ner', 'senter'])
+    except Exception as e:
+        print(f"Warning: Could not load spaCy model, using WordNet lemmatizer: {e}")
+        return None
+    nlp.max_length = 2_000_000
+    return nlp
+
+def lemmatize_texts(texts: list) -> list:
+    """
+    Tokenize and lemmatize several texts in one batch
+
+    Args:
+        texts (list): List of input texts
+
+    Returns:
+        list: One list of lemmas per input text
+    """
+    nlp = _load_spacy()
+    try:
+        if nlp is not None:
+            return [[token.lemma_ for token in doc] for doc in nlp.pipe(texts, batch_size=64)]
+        return [[_LEMMATIZER.lemmatize(token) for token in _tokenize_cached(text)] for text in texts]
+    except Exception as e:
+        st.warning(f"Lemmatization failed: {str(e)}")
+        return [list(_tokenize_cached(text)) for text in texts]
+
 def lemmatize_tokens(tokens: list) -> list:
     """
     Lemmatize tokens to their base form
@@ -162,13 +255,22 @@ def lemmatize_tokens(tokens: list) -> list:
         list: Lemmatized tokens
     """
     try:
-        lemmatizer = WordNetLemmatizer()
-        lemmatized = [lemmatizer.lemmatize(token) for token in tokens]
-        return lemmatized
+        return list(_lemmatize_cached(tuple(tokens)))
     except Exception as e:
         st.warning(f"Lemmatization failed: {str(e)}")
         return tokens
 
+@lru_cache(maxsize=1024)
+def _lemmatize_cached(tokens: tuple) -> tuple:
+    """Lemmatize pre-split tokens, cached per input; returns an immutable tuple"""
+    nlp = _load_spacy()
+    if nlp is None:
+        return tuple(_LEMMATIZER.lemmatize(token) for token in tokens)
+    # Keep the caller's tokenization; run the pipeline on a pre-built Doc
+    from spacy.tokens import Doc
+    doc = nlp(Doc(nlp.vocab, words=list(tokens)))
+    return tuple(token.lemma_ for token in doc)
+
 def extract_skills(text: str) -> list:
     """
     Extract skills from text using predefined skill sets
@@ -179,62 +281,71 @@ def extract_skills(text: str) -> list:
     Returns:
         list: List of extracted skills
     """
-    if not text:
-        return []
-
     try:
-        # Clean and tokenize text
-        cleaned_text = clean_text(text)
-        tokens = tokenize_text(cleaned_text)
-
-        # Convert to set for faster lookup
-        token_set = set(tokens)
+        return list(_extract_skills_cached(text))
+    except Exception as e:
+        # Failures are not cached, so the warning is shown on every call
+        st.warning(f"Skill extraction failed: {str(e)}")
+        return []
 
-        # Find matching skills
-        found_skills = []
+@lru_cache(maxsize=1024)
+def _extract_skills_cached(text: str) -> tuple:
+    """Extract skills, cached per input; returns an immutable sorted tuple; raises on failure"""
+    if not text:
+        return ()
 
-        # Check for exact matches
-        for skill in TECHNICAL_SKILLS | SOFT_SKILLS:
-            if skill in cleaned_text.lower():
-                found_skills.append(skill.title())
+    # Clean text (clean_text output is already lowercase)
+    cleaned_text = clean_text(text)
 
-        # Also check for partial matches in tokens
-        for token in tokens:
-            token_lower = token.lower()
-            if token_lower in TECHNICAL_SKILLS or token_lower in SOFT_SKILLS:
-                if token_lower.title() not in found_skills:
-                    found_skills.append(token_lower.title())
+    # Find matching skills (single-word and multi-word) in one pass
+    found_skills = set(map(_SKILL_TITLES.__getitem__, _SKILL_RE.findall(cleaned_text)))
 
-        # Remove duplicates and sort
-        found_skills = list(set(found_skills))
-        found_skills.sort()
+    # Sort for stable output
+    return tuple(sorted(found_skills))
 
-        return found_skills
+# Sentence boundaries for text statistics: terminal punctuation followed by whitespace or the end
+_SENT_SPLIT = re.compile(r'[.!?]+(?:\s+|$)')
 
-    except Exception as e:
-        st.warning(f"Skill extraction failed: {str(e)}")
-        return []
-
-def get_text_statistics(text: str) -> dict:
+def get_text_statistics(text: str, *, tokens: list = None, use_punkt: bool = False) -> dict:
     """
-    Get basic statistics about the text
+    Get basic statistics about the text (cached; treat the result as read-only)
 
     Args:
-        text (str): Input text
+        text (str): Cleaned (lowercase) input text
+        tokens (list, optional): Tokens already produced by tokenize_text(text);
+            passing them skips tokenizing the text again
+        use_punkt (bool): Split sentences with NLTK's Punkt model instead of
+            the faster punctuation-based splitter
 
     Returns:
         dict: Text statistics
     """
+    if tokens is None:
+        return _text_statistics_cached(text, use_punkt)
+    return _text_statistics(text, tokens, use_punkt)
+
+@lru_cache(maxsize=32)
+def _text_statistics_cached(text: str, use_punkt: bool) -> dict:
+    """Text statistics for text alone, cached per input"""
+    return _text_statistics(text, _tokenize_cached(text), use_punkt)
+
+def _text_statistics(text: str, words, use_punkt: bool) -> dict:
+    """Compute text statistics from the text and its tokens"""
     try:
-        sentences = sent_tokenize(text)
-        words = tokenize_text(text)
-        cleaned_words = remove_stopwords(words)
+        if use_punkt:
+            sentences = sent_tokenize(text)
+        else:
+            sentences = [sentence for sentence in _SENT_SPLIT.split(text) if sentence.strip()]
+
+        # Count non-stopwords without building a filtered list
+        stop_words = _get_stopwords()
+        cleaned_count = sum(1 for word in words if word not in stop_words)
 
         return {
             'total_sentences': len(sentences),
             'total_words': len(words),
             'unique_words': len(set(words)),
-            'cleaned_words': len(cleaned_words),
+            'cleaned_words': cleaned_count,
             'avg_words_per_sentence': len(words) / len(sentences) if sentences else 0
         }
     except Exception as e:
@@ -245,4 +356,3 @@ def get_text_statistics(text: str) -> dict:
             'cleaned_words': 0,
             'avg_words_per_sentence': 0
         }
-
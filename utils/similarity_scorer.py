@@ -1,14 +1,24 @@
 """
 Similarity Scoring Module
-Calculates resume-job match scores using TF-IDF and cosine similarity
+Calculates resume-job match scores using cosine similarity of hashed sublinear
+term frequencies (pairwise) or TF-IDF (batch), combined with skill overlap
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
 import numpy as np
-from utils.nlp_processor import clean_text, remove_stopwords, tokenize_text, extract_skills
+import re
+from functools import lru_cache
+from joblib import Parallel, delayed, effective_n_jobs
+from utils.nlp_processor import (clean_text, tokenize_text, extract_skills,
+                                 TECHNICAL_SKILLS, SOFT_SKILLS, _get_stopwords)
 import streamlit as st
 
+try:
+    import ahocorasick
+except ImportError:  # Fall back to per-keyword substring scans
+    ahocorasick = None
+
 def calculate_jaccard_similarity(text1: str, text2: str) -> float:
     """
     Calculate Jaccard similarity as fallback when TF-IDF fails
@@ -21,17 +31,14 @@ def calculate_jaccard_similarity(text1: str, text2: str) -> float:
         float: Similarity score as percentage (0-100)
     """
     try:
-        # Tokenize and create sets
-        tokens1 = set(tokenize_text(text1.lower()))
-        tokens2 = set(tokenize_text(text2.lower()))
-
-        # Remove stopwords
-        tokens1 = set(remove_stopwords(list(tokens1)))
-        tokens2 = set(remove_stopwords(list(tokens2)))
+        # Tokenize into sets without stopwords
+        stop_words = _get_stopwords()
+        tokens1 = {token for token in tokenize_text(text1.lower()) if token not in stop_words}
+        tokens2 = {token for token in tokenize_text(text2.lower()) if token not in stop_words}
 
-        # Calculate Jaccard similarity
+        # Calculate Jaccard similarity (union size without building the union set)
         intersection = len(tokens1 & tokens2)
-        union = len(tokens1 | tokens2)
+        union = len(tokens1) + len(tokens2) - intersection
 
         if union == 0:
             return 0.0
@@ -43,52 +50,110 @@ def calculate_jaccard_similarity(text1: str, text2: str) -> float:
         st.warning(f"Jaccard similarity calculation failed: {str(e)}")
         return 0.0
 
-def calculate_tfidf_similarity(resume_text: str, job_text: str) -> float:
+# TF-IDF settings tuned for resume-job matching
+_TFIDF_PARAMS = dict(
+    max_features=1000,
+    stop_words='english',
+    ngram_range=(1, 2),  # Include unigrams and bigrams
+    min_df=1,
+    max_df=1.0,  # Allow terms that appear in all documents
+    sublinear_tf=True,  # Better handling of term frequency
+    use_idf=True,
+    smooth_idf=True,
+    norm='l2'  # L2 normalization for cosine similarity
+)
+
+# Stateless term hasher for pairwise comparisons; needs no fit or vocabulary
+_HV = HashingVectorizer(
+    n_features=2 ** 18,
+    stop_words='english',
+    ngram_range=(1, 2),
+    alternate_sign=False,
+    norm=None  # Sublinear TF and L2 norm are applied after hashing
+)
+
+def score_batch(job_text: str, resume_texts: list) -> np.ndarray:
+    """
+    Calculate TF-IDF similarity of many resumes against one job description
+    The job and all resumes are vectorized together in a single fit
+
+    Note: IDF is fitted over the whole batch, so these scores differ from
+    calculate_tfidf_similarity (hashed sublinear TF, no IDF) for the same
+    pair, and a resume's score depends on the other resumes in the batch.
+    Use score_resumes for scores consistent with calculate_similarity_score.
+
+    Args:
+        job_text (str): Cleaned job description text
+        resume_texts (list): Cleaned resume texts
+
+    Returns:
+        np.ndarray: TF-IDF similarity score (0-100) for each resume
+
+    Raises:
+        ValueError: If the texts yield too few features to compare
+    """
+    if not resume_texts:
+        return np.zeros(0)
+
+    vectorizer = TfidfVectorizer(**_TFIDF_PARAMS)
+    tfidf_matrix = vectorizer.fit_transform([job_text] + list(resume_texts))
+
+    # Check if we have enough features
+    if tfidf_matrix.shape[1] < 2:
+        raise ValueError("Too few features for TF-IDF similarity")
+
+    # Rows are L2-normalized, so one sparse matrix-vector product gives every cosine similarity
+    scores = (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+
+    # Ensure scores are between 0 and 1
+    return np.clip(scores, 0.0, 1.0) * 100
+
+def _tf_vector(text: str):
+    """Hashed sublinear term frequencies of text, as an L2-normalized sparse row"""
+    vector = _HV.transform([text])
+    vector.data = 1 + np.log(vector.data)
+    return normalize(vector, norm='l2')
+
+def calculate_tfidf_similarity(resume_text: str, job_text: str, job_vector=None) -> float:
     """
-    Calculate TF-IDF based text similarity (40% of total hybrid score)
+    Calculate term-frequency text similarity (40% of total hybrid score)
     Focuses on overall text similarity and context
 
+    Despite the name this no longer applies IDF: it is the cosine similarity of
+    hashed, sublinear (1 + log tf) unigram and bigram counts with English
+    stopwords removed. Scores therefore differ from score_batch's fitted TF-IDF.
+
     Args:
         resume_text (str): Cleaned resume text
         job_text (str): Cleaned job description text
+        job_vector: Precomputed _tf_vector(job_text), if already available
 
     Returns:
-        float: TF-IDF similarity score (0-100)
+        float: Text similarity score (0-100)
     """
     try:
-        # Create TF-IDF vectorizer optimized for resume-job matching
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2),  # Include unigrams and bigrams
-            min_df=1,
-            max_df=1.0,  # Allow terms that appear in all documents
-            sublinear_tf=True,  # Better handling of term frequency
-            use_idf=True,
-            smooth_idf=True,
-            norm='l2'  # L2 normalization for cosine similarity
-        )
-
-        documents = [resume_text, job_text]
-        tfidf_matrix = vectorizer.fit_transform(documents)
+        # IDF carries little information over a two-document corpus, so use
+        # hashed sublinear term frequencies instead of fitting a vectorizer
+        resume_vector = _tf_vector(resume_text)
+        if job_vector is None:
+            job_vector = _tf_vector(job_text)
 
         # Check if we have enough features
-        if tfidf_matrix.shape[1] < 2:
+        if np.union1d(resume_vector.indices, job_vector.indices).size < 2:
             return calculate_jaccard_similarity(resume_text, job_text)
 
-        # Calculate cosine similarity
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-        similarity_score = similarity_matrix[0][1]
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarity_score = resume_vector.multiply(job_vector).sum()
 
         # Ensure score is between 0 and 1
-        similarity_score = max(0.0, min(1.0, similarity_score))
+        similarity_score = max(0.0, min(1.0, float(similarity_score)))
 
         return similarity_score * 100
 
     except Exception as e:
         return calculate_jaccard_similarity(resume_text, job_text)
 
-def calculate_skill_similarity(resume_text: str, job_text: str) -> float:
+def calculate_skill_similarity(resume_text: str, job_text: str, job_skills: frozenset = None) -> float:
     """
     Calculate skill-based similarity (60% of total hybrid score)
     This is the MOST IMPORTANT factor for resume-job matching
@@ -96,6 +161,7 @@ def calculate_skill_similarity(resume_text: str, job_text: str) -> float:
     Args:
         resume_text (str): Cleaned resume text
         job_text (str): Cleaned job description text
+        job_skills (frozenset): Precomputed skills of job_text, if already available
 
     Returns:
         float: Skill similarity score (0-100)
@@ -103,7 +169,8 @@ def calculate_skill_similarity(resume_text: str, job_text: str) -> float:
     try:
         # Extract skills from both texts using existing skill extraction
         resume_skills = set(extract_skills(resume_text))
-        job_skills = set(extract_skills(job_text))
+        if job_skills is None:
+            job_skills = frozenset(extract_skills(job_text))
 
         if not resume_skills and not job_skills:
             return 0.0
@@ -128,13 +195,64 @@ def calculate_skill_similarity(resume_text: str, job_text: str) -> float:
         st.warning(f"Skill similarity calculation failed: {str(e)}")
         return 0.0
 
-def calculate_similarity_score(resume_text: str, job_text: str) -> float:
+# Stable bit position for every known skill, used to pack skill sets into bitmasks
+_SKILL_IDS = {skill: i for i, skill in enumerate(sorted(TECHNICAL_SKILLS | SOFT_SKILLS))}
+_MASK_WORDS = (len(_SKILL_IDS) + 63) // 64
+
+def _skill_masks(skill_lists: list) -> np.ndarray:
+    """Pack each list of skills into a row of uint64 bitmask words"""
+    masks = np.zeros((len(skill_lists), _MASK_WORDS), dtype=np.uint64)
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            skill_id = _SKILL_IDS[skill.lower()]
+            masks[row, skill_id // 64] |= np.uint64(1 << (skill_id % 64))
+    return masks
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Count set bits in each row of a uint64 bitmask array"""
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(masks).sum(axis=-1)
+    return np.unpackbits(masks.view(np.uint8), axis=-1).sum(axis=-1)
+
+def skill_score_batch(job_text: str, resume_texts: list) -> np.ndarray:
+    """
+    Calculate skill-based similarity of many resumes against one job description
+    Same scoring as calculate_skill_similarity, computed on skill bitmasks
+
+    Args:
+        job_text (str): Cleaned job description text
+        resume_texts (list): Cleaned resume texts
+
+    Returns:
+        np.ndarray: Skill similarity score (0-100) for each resume
+    """
+    job_mask = _skill_masks([extract_skills(job_text)])
+    resume_masks = _skill_masks([extract_skills(text) for text in resume_texts])
+
+    common = _popcount(resume_masks & job_mask)
+    union = _popcount(resume_masks | job_mask)
+
+    # Jaccard similarity: intersection / union
+    scores = np.divide(common, union, out=np.zeros(len(resume_texts)), where=union > 0)
+
+    # Boost score for strong skill matches (3+ common skills)
+    scores = np.where(common >= 3, np.minimum(1.0, scores * 1.2), scores)
+
+    # No skills on either side means no skill match
+    scores[(_popcount(resume_masks) == 0) | (_popcount(job_mask) == 0)] = 0.0
+
+    return scores * 100
+
+def calculate_similarity_score(resume_text: str, job_text: str,
+                               job_vector=None, job_skills: frozenset = None) -> float:
     """
     Calculate similarity score between resume and job description
 
     Args:
         resume_text (str): Cleaned resume text
         job_text (str): Cleaned job description text
+        job_vector: Precomputed _tf_vector(job_text), if already available
+        job_skills (frozenset): Precomputed skills of job_text, if already available
 
     Returns:
         float: Similarity score as percentage (0-100)
@@ -147,10 +265,10 @@ def calculate_similarity_score(resume_text: str, job_text: str) -> float:
         # This is crucial for resume-job matching accuracy
 
         # Calculate TF-IDF similarity (40% weight) - for overall text/context matching
-        tfidf_score = calculate_tfidf_similarity(resume_text, job_text)
+        tfidf_score = calculate_tfidf_similarity(resume_text, job_text, job_vector)
 
         # Calculate skill-based similarity (60% weight) - most important for job matching
-        skill_score = calculate_skill_similarity(resume_text, job_text)
+        skill_score = calculate_skill_similarity(resume_text, job_text, job_skills)
 
         # Combine scores: TF-IDF gives context, skills give technical relevance
         hybrid_score = (tfidf_score * 0.4) + (skill_score * 0.6)
@@ -164,9 +282,54 @@ def calculate_similarity_score(resume_text: str, job_text: str) -> float:
         st.error(f"Hybrid similarity calculation failed: {str(e)}")
         return 0.0
 
+def score_resumes(job_text: str, resume_texts: list, n_jobs: int = 1) -> list:
+    """
+    Score many resumes against one job description
+    Each score is the same hybrid score calculate_similarity_score gives
+
+    The job's term vector and skill set are computed once and shared by every
+    resume. Scoring is serial by default: a resume costs about 1.5 ms, while
+    each worker process spends seconds importing this module, so n_jobs > 1
+    only pays off for batches of thousands of resumes on several cores.
+
+    Args:
+        job_text (str): Cleaned job description text
+        resume_texts (list): Cleaned resume texts
+        n_jobs (int): Number of worker processes (-1 uses all cores)
+
+    Returns:
+        list: Similarity score (0-100) for each resume, in input order
+    """
+    job_vector = _tf_vector(job_text)
+    job_skills = frozenset(extract_skills(job_text))
+
+    n_workers = min(effective_n_jobs(n_jobs), len(resume_texts))
+    if n_workers <= 1:
+        return _score_chunk(resume_texts, job_text, job_vector, job_skills)
+
+    # One contiguous chunk per worker, so the job features are sent to each worker once
+    step = -(-len(resume_texts) // n_workers)
+    chunks = Parallel(n_jobs=n_workers)(
+        delayed(_score_chunk)(resume_texts[start:start + step], job_text, job_vector, job_skills)
+        for start in range(0, len(resume_texts), step)
+    )
+    return [score for chunk in chunks for score in chunk]
+
+def _score_chunk(resume_texts: list, job_text: str, job_vector, job_skills: frozenset) -> list:
+    """Score resumes against one job using its precomputed vector and skills"""
+    return [calculate_similarity_score(resume_text, job_text, job_vector, job_skills)
+            for resume_text in resume_texts]
+
+def _top_terms(feature_names: np.ndarray, scores: np.ndarray, mask: np.ndarray, top_n: int = 10) -> list:
+    """Return the top_n terms selected by mask, highest score first (ties keep term order)"""
+    indices = np.flatnonzero(mask)
+    order = np.argsort(-scores[indices], kind='stable')[:top_n]
+    return feature_names[indices[order]].tolist()
+
+
 def get_similarity_details(resume_text: str, job_text: str) -> dict:
     """
-    Get detailed similarity analysis
+    Get detailed similarity analysis (cached; treat the result as read-only)
 
     Args:
         resume_text (str): Cleaned resume text
@@ -176,66 +339,22 @@ def get_similarity_details(resume_text: str, job_text: str) -> dict:
         dict: Detailed similarity information
     """
     try:
-        if not resume_text or not job_text:
-            return {
-                'overall_score': 0.0,
-                'common_terms': [],
-                'resume_unique_terms': [],
-                'job_unique_terms': []
-            }
-
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-
-        documents = [resume_text, job_text]
-        tfidf_matrix = vectorizer.fit_transform(documents)
-
-        # Get feature names (terms)
-        feature_names = vectorizer.get_feature_names_out()
-
-        # Get TF-IDF scores for each document
-        resume_tfidf = tfidf_matrix[0].toarray()[0]
-        job_tfidf = tfidf_matrix[1].toarray()[0]
-
-        # Find common terms (terms that appear in both with significant scores)
-        common_terms = []
-        resume_unique = []
-        job_unique = []
-
-        threshold = 0.1  # Minimum TF-IDF score to consider
-
-        for i, term in enumerate(feature_names):
-            resume_score = resume_tfidf[i]
-            job_score = job_tfidf[i]
-
-            if resume_score > threshold and job_score > threshold:
-                common_terms.append((term, (resume_score + job_score) / 2))
-            elif resume_score > threshold:
-                resume_unique.append((term, resume_score))
-            elif job_score > threshold:
-                job_unique.append((term, job_score))
-
-        # Sort by TF-IDF score
-        common_terms.sort(key=lambda x: x[1], reverse=True)
-        resume_unique.sort(key=lambda x: x[1], reverse=True)
-        job_unique.sort(key=lambda x: x[1], reverse=True)
-
-        # Calculate overall score
-        overall_score = calculate_similarity_score(resume_text, job_text)
+        return _similarity_details_cached(resume_text, job_text)
 
+    except Exception as e:
+        # Failures are not cached, so the error is reported on every call
+        st.error(f"Detailed similarity analysis failed: {str(e)}")
         return {
-            'overall_score': overall_score,
-            'common_terms': [term for term, score in common_terms[:10]],  # Top 10
-            'resume_unique_terms': [term for term, score in resume_unique[:10]],  # Top 10
-            'job_unique_terms': [term for term, score in job_unique[:10]]  # Top 10
+            'overall_score': 0.0,
+            'common_terms': [],
+            'resume_unique_terms': [],
+            'job_unique_terms': []
         }
 
-    except Exception as e:
-        st.error(f"Detailed similarity analysis failed: {str(e)}")
+@lru_cache(maxsize=32)
+def _similarity_details_cached(resume_text: str, job_text: str) -> dict:
+    """Detailed similarity analysis, cached per input pair; raises on failure"""
+    if not resume_text or not job_text:
         return {
             'overall_score': 0.0,
             'common_terms': [],
@@ -243,6 +362,54 @@ def get_similarity_details(resume_text: str, job_text: str) -> dict:
             'job_unique_terms': []
         }
 
+    # Create TF-IDF vectorizer
+    vectorizer = TfidfVectorizer(
+        max_features=1000,
+        stop_words='english',
+        ngram_range=(1, 2)
+    )
+
+    documents = [resume_text, job_text]
+    tfidf_matrix = vectorizer.fit_transform(documents)
+
+    # Get feature names (terms)
+    feature_names = vectorizer.get_feature_names_out()
+
+    # Get TF-IDF scores for each document
+    resume_tfidf = tfidf_matrix[0].toarray().ravel()
+    job_tfidf = tfidf_matrix[1].toarray().ravel()
+
+    threshold = 0.1  # Minimum TF-IDF score to consider
+    resume_hits = resume_tfidf > threshold
+    job_hits = job_tfidf > threshold
+
+    # Common terms appear in both with significant scores; the rest are unique to one side
+    common_terms = _top_terms(feature_names, (resume_tfidf + job_tfidf) / 2, resume_hits & job_hits)
+    resume_unique = _top_terms(feature_names, resume_tfidf, resume_hits & ~job_hits)
+    job_unique = _top_terms(feature_names, job_tfidf, job_hits & ~resume_hits)
+
+    # Calculate overall score
+    overall_score = calculate_similarity_score(resume_text, job_text)
+
+    return {
+        'overall_score': overall_score,
+        'common_terms': common_terms,
+        'resume_unique_terms': resume_unique,
+        'job_unique_terms': job_unique
+    }
+
+@lru_cache(maxsize=64)
+def _keyword_automaton(keywords: tuple):
+    """Build an Aho-Corasick automaton for a set of lowercase keywords (None if all are empty)"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        if keyword:
+            automaton.add_word(keyword, keyword)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
 def calculate_keyword_match_score(resume_text: str, job_keywords: list) -> float:
     """
     Calculate how well resume matches specific job keywords
@@ -258,16 +425,17 @@ def calculate_keyword_match_score(resume_text: str, job_keywords: list) -> float
         if not resume_text or not job_keywords:
             return 0.0
 
-        resume_tokens = tokenize_text(resume_text.lower())
-        resume_tokens = remove_stopwords(resume_tokens)
-        resume_token_set = set(resume_tokens)
+        resume_text_lower = resume_text.lower()
+        keywords_lower = list(map(str.lower, job_keywords))
 
-        matched_keywords = 0
-        for keyword in job_keywords:
-            keyword_lower = keyword.lower()
-            # Check if keyword or its variations exist in resume
-            if keyword_lower in resume_token_set or keyword_lower in resume_text.lower():
-                matched_keywords += 1
+        # Check if each keyword or its variations exist in resume
+        if ahocorasick is not None:
+            # Find every keyword in one pass over the resume
+            automaton = _keyword_automaton(tuple(sorted(set(keywords_lower))))
+            found = {keyword for _, keyword in automaton.iter(resume_text_lower)} if automaton is not None else set()
+            matched_keywords = sum(1 for keyword in keywords_lower if not keyword or keyword in found)
+        else:
+            matched_keywords = sum(1 for keyword in keywords_lower if keyword in resume_text_lower)
 
         match_score = (matched_keywords / len(job_keywords)) * 100
         return round(match_score, 1)
@@ -276,9 +444,10 @@ def calculate_keyword_match_score(resume_text: str, job_keywords: list) -> float
         st.warning(f"Keyword match calculation failed: {str(e)}")
         return 0.0
 
+@lru_cache(maxsize=32)
 def get_readability_score(text: str) -> dict:
     """
-    Calculate basic readability metrics
+    Calculate basic readability metrics (cached; treat the result as read-only)
 
     Args:
         text (str): Input text
@@ -291,7 +460,7 @@ def get_readability_score(text: str) -> dict:
         words = text.split()
         total_sentences = len([s for s in sentences if s.strip()])
         total_words = len(words)
-        total_syllables = sum(count_syllables(word) for word in words)
+        total_syllables = count_text_syllables(text)
 
         # Flesch Reading Ease Score
         if total_sentences > 0 and total_words > 0:
@@ -315,6 +484,14 @@ def get_readability_score(text: str) -> dict:
             'avg_words_per_sentence': 0
         }
 
+# Syllable counting patterns: each vowel run is a syllable, a trailing 'e' is
+# silent, and every word counts for at least one syllable
+_VOWEL_RUN = re.compile(r'[aeiouy]+')
+_TRAILING_E = re.compile(r'e(?!\S)')
+# Words whose count would drop below one: no vowels at all, or a single
+# vowel run that ends in 'e' (e.g. "the", "free")
+_FLOOR_WORD = re.compile(r'(?<!\S)(?:[^aeiouy\s]+|[^aeiouy\s]*[aeiouy]*e)(?!\S)')
+
 def count_syllables(word: str) -> int:
     """
     Count syllables in a word (basic implementation)
@@ -326,21 +503,25 @@ def count_syllables(word: str) -> int:
         int: Number of syllables
     """
     word = word.lower()
-    count = 0
-    vowels = "aeiouy"
-
-    if word[0] in vowels:
-        count += 1
-
-    for i in range(1, len(word)):
-        if word[i] in vowels and word[i - 1] not in vowels:
-            count += 1
+    count = len(_VOWEL_RUN.findall(word))
 
     if word.endswith("e"):
         count -= 1
 
-    if count == 0:
-        count += 1
+    return max(1, count)
+
+def count_text_syllables(text: str) -> int:
+    """
+    Count syllables over all whitespace-separated words of a text
+    Equivalent to summing count_syllables per word, but done in a few regex passes
 
-    return count
+    Args:
+        text (str): Input text
 
+    Returns:
+        int: Total number of syllables
+    """
+    text = text.lower()
+    return (len(_VOWEL_RUN.findall(text))
+            - len(_TRAILING_E.findall(text))
+            + len(_FLOOR_WORD.findall(text)))
@@ -4,7 +4,45 @@ Identifies missing skills and provides gap analysis between resume and job requi
 """
 
 from utils.nlp_processor import extract_skills, clean_text, tokenize_text
-import streamlit as st
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Skill categories for categorize_skills, as frozensets for O(1) membership checks
+_TECH_CATEGORIES = {
+    category: frozenset(category_skills) for category, category_skills in {
+        'Programming Languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'r', 'scala'],
+        'Databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle'],
+        'Web Technologies': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring'],
+        'Cloud Platforms': ['aws', 'azure', 'gcp', 'heroku', 'digitalocean'],
+        'DevOps & Tools': ['docker', 'kubernetes', 'jenkins', 'git', 'linux', 'bash'],
+        'AI/ML': ['machine learning', 'deep learning', 'nlp', 'computer vision', 'tensorflow', 'pytorch', 'scikit-learn']
+    }.items()
+}
+
+_SOFT_SKILLS = frozenset(['communication', 'leadership', 'teamwork', 'problem solving', 'analytical', 'project management'])
+
+# Alternative or related skills for suggest_alternative_skills, already title-cased
+_SKILL_ALT = {
+    skill: tuple(alt.title() for alt in alternatives) for skill, alternatives in {
+        'python': ['java', 'r', 'scala', 'julia'],
+        'java': ['kotlin', 'scala', 'c#', 'python'],
+        'javascript': ['typescript', 'coffeescript', 'dart'],
+        'sql': ['nosql', 'mongodb', 'postgresql', 'mysql'],
+        'aws': ['azure', 'gcp', 'heroku', 'digitalocean'],
+        'docker': ['kubernetes', 'podman', 'containerd'],
+        'react': ['angular', 'vue', 'svelte', 'ember'],
+        'machine learning': ['data science', 'ai', 'deep learning', 'statistics'],
+        'tensorflow': ['pytorch', 'keras', 'scikit-learn', 'xgboost'],
+        'git': ['svn', 'mercurial', 'perforce']
+    }.items()
+}
+
+@lru_cache(maxsize=256)
+def _normalize(skills: tuple) -> frozenset:
+    """Canonical (trimmed, lowercase) set of skills, cached so repeated analyses of the same lists reuse it"""
+    # Chained C-level maps avoid a Python frame per skill
+    return frozenset(map(str.lower, map(str.strip, skills)))
 
 def analyze_skill_gaps(resume_skills: list, job_skills: list) -> list:
     """
@@ -15,30 +53,25 @@ def analyze_skill_gaps(resume_skills: list, job_skills: list) -> list:
         job_skills (list): Skills required by job
 
     Returns:
-        list: List of missing skills
+        list: Sorted list of missing skills in canonical lowercase form;
+            title-case them for display
     """
-    try:
-        if not job_skills:
-            return []
-
-        # Convert to sets for easier comparison
-        resume_skills_set = set(skill.lower() for skill in resume_skills)
-        job_skills_set = set(skill.lower() for skill in job_skills)
-
-        # Find missing skills
-        missing_skills = job_skills_set - resume_skills_set
+    if not job_skills:
+        return []
 
-        # Convert back to list and title case
-        missing_skills_list = [skill.title() for skill in missing_skills]
+    # Convert to sets for easier comparison
+    resume_skills_set = _normalize(tuple(resume_skills))
+    job_skills_set = _normalize(tuple(job_skills))
 
-        # Sort by priority (can be enhanced with skill importance scoring)
-        missing_skills_list.sort()
+    # Common case: the resume covers every required skill
+    if job_skills_set <= resume_skills_set:
+        return []
 
-        return missing_skills_list
+    # Find missing skills
+    missing_skills = job_skills_set - resume_skills_set
 
-    except Exception as e:
-        st.warning(f"Skill gap analysis failed: {str(e)}")
-        return []
+    # Sort by priority (can be enhanced with skill importance scoring)
+    return sorted(missing_skills)
 
 def get_skill_overlap_analysis(resume_skills: list, job_skills: list) -> dict:
     """
@@ -49,40 +82,40 @@ def get_skill_overlap_analysis(resume_skills: list, job_skills: list) -> dict:
         job_skills (list): Skills required by job
 
     Returns:
-        dict: Detailed skill analysis
+        dict: Detailed skill analysis; skill lists hold canonical lowercase names
     """
-    try:
-        resume_skills_set = set(skill.lower() for skill in resume_skills)
-        job_skills_set = set(skill.lower() for skill in job_skills)
-
-        # Calculate overlaps
-        matching_skills = resume_skills_set & job_skills_set
-        missing_skills = job_skills_set - resume_skills_set
-        extra_skills = resume_skills_set - job_skills_set
-
-        # Calculate percentages
-        total_job_skills = len(job_skills_set)
-        match_percentage = (len(matching_skills) / total_job_skills * 100) if total_job_skills > 0 else 0
-
-        return {
-            'matching_skills': [skill.title() for skill in matching_skills],
-            'missing_skills': [skill.title() for skill in missing_skills],
-            'extra_skills': [skill.title() for skill in extra_skills],
-            'match_percentage': round(match_percentage, 1),
-            'total_job_skills': total_job_skills,
-            'total_resume_skills': len(resume_skills_set)
-        }
-
-    except Exception as e:
-        st.warning(f"Detailed skill analysis failed: {str(e)}")
-        return {
-            'matching_skills': [],
-            'missing_skills': [],
-            'extra_skills': [],
-            'match_percentage': 0.0,
-            'total_job_skills': 0,
-            'total_resume_skills': 0
-        }
+    resume_skills_set = _normalize(tuple(resume_skills))
+    job_skills_set = _normalize(tuple(job_skills))
+
+    # Calculate overlaps
+    matching_skills = resume_skills_set & job_skills_set
+    missing_skills = job_skills_set - resume_skills_set
+    extra_skills = resume_skills_set - job_skills_set
+
+    # Calculate percentages
+    total_job_skills = len(job_skills_set)
+    match_percentage = (len(matching_skills) / total_job_skills * 100) if total_job_skills > 0 else 0
+
+    return {
+        'matching_skills': sorted(matching_skills),
+        'missing_skills': sorted(missing_skills),
+        'extra_skills': sorted(extra_skills),
+        'match_percentage': round(match_percentage, 1),
+        'total_job_skills': total_job_skills,
+        'total_resume_skills': len(resume_skills_set)
+    }
+
+@lru_cache(maxsize=64)
+def _skill_pattern(skills: tuple):
+    """Compiled regex matching any of the lowercase skills as a whole word or phrase; None if empty"""
+    # Longest alternatives first so 'javascript' is not counted as 'java';
+    # lookarounds instead of \b so skills ending in symbols ('c++') still match,
+    # and any run of whitespace may separate the words of a multi-word skill
+    alternatives = [re.escape(skill).replace(r'\ ', r'\s+')
+                    for skill in sorted(filter(None, skills), key=len, reverse=True)]
+    if not alternatives:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?!\w)')
 
 def prioritize_missing_skills(missing_skills: list, job_description: str) -> list:
     """
@@ -95,26 +128,19 @@ def prioritize_missing_skills(missing_skills: list, job_description: str) -> lis
     Returns:
         list: Prioritized list of missing skills
     """
-    try:
-        if not missing_skills or not job_description:
-            return missing_skills
-
-        job_text_lower = job_description.lower()
-
-        # Count occurrences of each skill in job description
-        skill_counts = {}
-        for skill in missing_skills:
-            skill_lower = skill.lower()
-            count = job_text_lower.count(skill_lower)
-            skill_counts[skill] = count
+    if not missing_skills or not job_description:
+        return missing_skills
 
-        # Sort by frequency (higher frequency = higher priority)
-        prioritized_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
-        return [skill for skill, count in prioritized_skills]
+    job_text_lower = job_description.lower()
 
-    except Exception as e:
-        st.warning(f"Skill prioritization failed: {str(e)}")
+    # Count occurrences of each skill in job description, in one regex pass
+    pattern = _skill_pattern(tuple(sorted(_normalize(tuple(missing_skills)))))
+    if pattern is None:
         return missing_skills
+    skill_counts = Counter(' '.join(match.split()) for match in pattern.findall(job_text_lower))
+
+    # Sort by frequency (higher frequency = higher priority)
+    return sorted(missing_skills, key=lambda skill: skill_counts[skill.strip().lower()], reverse=True)
 
 def suggest_alternative_skills(missing_skill: str) -> list:
     """
@@ -126,26 +152,7 @@ def suggest_alternative_skills(missing_skill: str) -> list:
     Returns:
         list: List of alternative skills
     """
-    # Skill mapping dictionary (can be expanded)
-    skill_alternatives = {
-        'python': ['java', 'r', 'scala', 'julia'],
-        'java': ['kotlin', 'scala', 'c#', 'python'],
-        'javascript': ['typescript', 'coffeescript', 'dart'],
-        'sql': ['nosql', 'mongodb', 'postgresql', 'mysql'],
-        'aws': ['azure', 'gcp', 'heroku', 'digitalocean'],
-        'docker': ['kubernetes', 'podman', 'containerd'],
-        'react': ['angular', 'vue', 'svelte', 'ember'],
-        'machine learning': ['data science', 'ai', 'deep learning', 'statistics'],
-        'tensorflow': ['pytorch', 'keras', 'scikit-learn', 'xgboost'],
-        'git': ['svn', 'mercurial', 'perforce']
-    }
-
-    skill_lower = missing_skill.lower()
-
-    if skill_lower in skill_alternatives:
-        return [alt.title() for alt in skill_alternatives[skill_lower]]
-
-    return []
+    return list(_SKILL_ALT.get(missing_skill.lower(), ()))
 
 def categorize_skills(skills: list) -> dict:
     """
@@ -157,41 +164,25 @@ def categorize_skills(skills: list) -> dict:
     Returns:
         dict: Categorized skills
     """
-    try:
-        # Define skill categories
-        technical_categories = {
-            'Programming Languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'r', 'scala'],
-            'Databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle'],
-            'Web Technologies': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring'],
-            'Cloud Platforms': ['aws', 'azure', 'gcp', 'heroku', 'digitalocean'],
-            'DevOps & Tools': ['docker', 'kubernetes', 'jenkins', 'git', 'linux', 'bash'],
-            'AI/ML': ['machine learning', 'deep learning', 'nlp', 'computer vision', 'tensorflow', 'pytorch', 'scikit-learn']
-        }
-
-        soft_skills = ['communication', 'leadership', 'teamwork', 'problem solving', 'analytical', 'project management']
-
-        categorized = {
-            'Technical Skills': {},
-            'Soft Skills': []
-        }
-
-        skills_lower = [skill.lower() for skill in skills]
-
-        # Categorize technical skills
-        for category, category_skills in technical_categories.items():
-            matching_skills = [skill.title() for skill in skills
-                             if skill.lower() in category_skills]
-            if matching_skills:
-                categorized['Technical Skills'][category] = matching_skills
-
-        # Find soft skills
-        for skill in skills:
-            if skill.lower() in soft_skills:
-                categorized['Soft Skills'].append(skill)
-
-        return categorized
-
-    except Exception as e:
-        st.warning(f"Skill categorization failed: {str(e)}")
-        return {'Technical Skills': {}, 'Soft Skills': []}
+    categorized = {
+        'Technical Skills': {},
+        'Soft Skills': []
+    }
+
+    # Lowercase each skill once and reuse it for every category
+    skill_pairs = list(zip(skills, map(str.lower, skills)))
+
+    # Categorize technical skills
+    for category, category_skills in _TECH_CATEGORIES.items():
+        matching_skills = [skill.title() for skill, skill_lower in skill_pairs
+                           if skill_lower in category_skills]
+        if matching_skills:
+            categorized['Technical Skills'][category] = matching_skills
+
+    # Find soft skills
+    categorized['Soft Skills'] = [skill for skill, skill_lower in skill_pairs
+                                  if skill_lower in _SOFT_SKILLS]
+
+    return categorized
+
 
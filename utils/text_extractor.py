@@ -3,11 +3,28 @@ Text Extraction Module
 Handles extraction of text from various file formats (PDF, DOCX)
 """
 
-import PyPDF2
-from docx import Document
+import hashlib
 import io
+import os
+import zipfile
+import pypdf
+from lxml import etree
 import streamlit as st
 
+# WordprocessingML element names used to read DOCX text straight from the XML
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W = '{%s}' % _W_NS
+_RUN_CONTENT = etree.XPath(
+    './w:r/w:t | ./w:r/w:tab | ./w:r/w:br | ./w:r/w:cr'
+    ' | ./w:hyperlink/w:r/w:t | ./w:hyperlink/w:r/w:tab | ./w:hyperlink/w:r/w:br | ./w:hyperlink/w:r/w:cr',
+    namespaces={'w': _W_NS}
+)
+_RUN_SPECIAL = {_W + 'tab': '\t', _W + 'br': '\n', _W + 'cr': '\n'}
+
+# Uploaded documents are untrusted: never resolve entities or fetch DTDs, and
+# keep libxml2's default depth and size limits
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
 def extract_text_from_file(uploaded_file) -> str:
     """
     Extract text from uploaded file (PDF or DOCX)
@@ -20,19 +37,31 @@ def extract_text_from_file(uploaded_file) -> str:
     """
     try:
         # Get file extension
-        file_name = uploaded_file.name.lower()
+        extension = os.path.splitext(uploaded_file.name.lower())[1]
 
-        if file_name.endswith('.pdf'):
-            return extract_text_from_pdf(uploaded_file)
-        elif file_name.endswith('.docx'):
-            return extract_text_from_docx(uploaded_file)
-        else:
+        if extension not in ('.pdf', '.docx'):
             raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
 
+        # Key the cache on a digest of the content so re-uploads of the same
+        # resume skip parsing. seek/read works for any file-like object, not
+        # only Streamlit uploads
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return _extract_text_cached(digest, extension, data)
+
     except Exception as e:
         st.error(f"Error extracting text: {str(e)}")
         return ""
 
+@st.cache_data(show_spinner=False, max_entries=128)
+def _extract_text_cached(digest: str, extension: str, _data: bytes) -> str:
+    """Extract text from raw file content, cached per content digest"""
+    # _data is excluded from the cache key; digest identifies it
+    if extension == '.pdf':
+        return extract_text_from_pdf(io.BytesIO(_data))
+    return extract_text_from_docx(io.BytesIO(_data))
+
 def extract_text_from_pdf(uploaded_file) -> str:
     """
     Extract text from PDF file
@@ -44,15 +73,19 @@ def extract_text_from_pdf(uploaded_file) -> str:
         str: Extracted text
     """
     try:
-        # Create PDF reader object
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
+        # Parse the upload in place: it is already an in-memory stream, and
+        # copying it into a new BytesIO would double peak memory.
+        # Non-strict mode tolerates the minor spec violations common in
+        # exported resumes instead of failing
+        uploaded_file.seek(0)
+        pdf_reader = pypdf.PdfReader(uploaded_file, strict=False)
 
-        # Extract text from all pages
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        # Extract text from all pages. extract_text only interprets text
+        # operators and form XObjects; image XObjects (logos, photos) are
+        # skipped without decoding their streams
+        parts = [page.extract_text() or "" for page in pdf_reader.pages]
 
-        return text.strip()
+        return "\n".join(parts).strip()
 
     except Exception as e:
         raise Exception(f"PDF extraction failed: {str(e)}")
@@ -68,25 +101,41 @@ def extract_text_from_docx(uploaded_file) -> str:
         str: Extracted text
     """
     try:
-        # Load the document
-        doc = Document(io.BytesIO(uploaded_file.read()))
+        # Read the main document part straight from the upload's zip archive
+        uploaded_file.seek(0)
+        with zipfile.ZipFile(uploaded_file) as archive:
+            root = etree.fromstring(archive.read('word/document.xml'), _XML_PARSER)
+        body = root.find(_W + 'body')
 
         # Extract text from all paragraphs
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        parts = [_paragraph_text(paragraph) for paragraph in body.iterchildren(_W + 'p')]
 
-        # Also extract text from tables if any
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + "\n"
+        # Also extract text from tables if any. Unlike python-docx's row.cells,
+        # a merged cell is read once rather than once per grid column it spans
+        for table in body.iterchildren(_W + 'tbl'):
+            for row in table.iterchildren(_W + 'tr'):
+                parts.extend(
+                    "\n".join(_paragraph_text(paragraph) for paragraph in cell.iterchildren(_W + 'p'))
+                    for cell in row.iterchildren(_W + 'tc')
+                )
 
-        return text.strip()
+        return "\n".join(parts).strip()
 
     except Exception as e:
         raise Exception(f"DOCX extraction failed: {str(e)}")
 
+def _paragraph_text(paragraph) -> str:
+    """
+    Text of a w:p element: its runs, including those inside hyperlinks
+
+    Every w:br becomes a newline, page and column breaks included; python-docx
+    drops those, which glues the words on either side together.
+    """
+    return ''.join(
+        (node.text or '') if node.tag == _W + 't' else _RUN_SPECIAL[node.tag]
+        for node in _RUN_CONTENT(paragraph)
+    )
+
 def get_file_info(uploaded_file) -> dict:
     """
     Get basic information about the uploaded file